@@ -4,8 +4,14 @@ import sys
 import os
 import glob
 import subprocess
-from pathlib import Path
 import argparse
+import atexit
+import collections
+import concurrent.futures
+import functools
+import itertools
+import mmap
+import pickle
 from typing import List, Set
 import tempfile
 
@@ -18,41 +24,390 @@ def log_file_status(included_files: List[str], excluded_files: List[tuple]):
         print(f"- {f} ({reason})")
 
 
-def load_gitignore_patterns():
-    """Load .gitignore patterns from current directory"""
-    gitignore_path = ".gitignore"
-    if not os.path.exists(gitignore_path):
-        return []
+class _Re2Spec:
+    """PathSpec-compatible matcher backed by a single re2 alternation.
+
+    All patterns are fused into one DFA, so matching a path is a single
+    linear scan regardless of pattern count.
+    """
+
+    def __init__(self, regex):
+        self._regex = regex
+
+    @staticmethod
+    def _norm(path):
+        if os.sep != "/":
+            path = path.replace(os.sep, "/")
+        if path.startswith("./"):
+            path = path[2:]
+        return path
+
+    def match_file(self, path):
+        return self._regex.search(self._norm(path)) is not None
+
+    def match_files(self, files):
+        search = self._regex.search
+        return (f for f in files if search(self._norm(f)) is not None)
+
+
+def _fuse_spec_re2(spec):
+    """Fuse a PathSpec's pattern regexes into one re2 DFA, or None.
+
+    Negated patterns need ordered last-match-wins evaluation, which a
+    flat alternation cannot express; those specs stay on pathspec.
+    """
+    try:
+        import re2
+    except ImportError:
+        return None
+    fragments = []
+    for pat in spec.patterns:
+        if pat.regex is None:
+            continue
+        if not pat.include:
+            return None
+        # pathspec marks directory matches with a named group; drop the
+        # name so fragments can coexist in one alternation
+        fragment = pat.regex.pattern.replace("(?P<ps_d>", "(?:")
+        fragments.append(f"(?:{fragment})")
+    if not fragments:
+        return None
+    try:
+        return _Re2Spec(re2.compile("|".join(fragments)))
+    except re2.error:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_spec(gitignore_path, mtime):
+    """Compile .gitignore into a PathSpec, cached across calls keyed by mtime."""
+    import pathspec
 
     with open(gitignore_path, "r") as f:
         patterns = [
             line.strip() for line in f if line.strip() and not line.startswith("#")
         ]
-    return patterns
+    if not patterns:
+        return None
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+    return _fuse_spec_re2(spec) or spec
+
+
+def load_gitignore_spec():
+    """Load the compiled .gitignore spec for the current directory, or None"""
+    gitignore_path = ".gitignore"
+    if not os.path.exists(gitignore_path):
+        return None
+    try:
+        return _load_spec(gitignore_path, os.path.getmtime(gitignore_path))
+    except ImportError:
+        print("Warning: pathspec module not found. Install with: pip install pathspec")
+        print("Skipping .gitignore filtering.")
+        return None
 
 
 def is_git_path(path):
     """Check if path is within .git directory"""
-    return ".git" in Path(path).parts
+    # Substring scan instead of allocating Path(...).parts per call
+    return f"{os.sep}.git{os.sep}" in f"{os.sep}{path}{os.sep}"
+
+
+# Patterns equivalent to "every file under the current directory"
+_RECURSIVE_ALL = {"**", "**/*", "./**", "./**/*"}
+
+
+def _walk(root, spec, excluded=None):
+    """Yield file paths under root via scandir, pruning ignored dirs.
+
+    A pruned directory is reported once (its root, with trailing slash)
+    through the optional excluded list, keeping the include/exclude log
+    honest about subtrees that were never descended into.
+
+    Matches glob('**') semantics: hidden entries are skipped (which also
+    covers .git), and symlinks to files and directories are followed,
+    including glob's exposure to symlink cycles. DirEntry type checks
+    use cached dirent info, and skipping an ignored directory avoids
+    stat'ing every descendant. Directory paths get a trailing slash so
+    dir-only gitignore patterns match.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue  # glob excludes hidden files and dirs
+            if entry.is_dir():
+                if spec is not None and spec.match_file(entry.path + "/"):
+                    if excluded is not None:
+                        pruned = entry.path + "/"
+                        if pruned.startswith(f".{os.sep}"):
+                            pruned = pruned[2:]
+                        excluded.append((pruned, "gitignore"))
+                    continue
+                yield from _walk(entry.path, spec, excluded)
+            elif entry.is_file():
+                yield entry.path
+
+
+# Bytes considered text; built once instead of per probe. NUL is absent,
+# so it survives the translate-delete below and flags the file as binary.
+_TEXT_CHARS = bytes(bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100))))
+_DELETE_TABLE = bytes.maketrans(b"", b"")
+
+
+def _is_binary_chunk(chunk):
+    """Heuristic text check on a probe chunk (shared by all probe paths)."""
+    # Anything left after deleting the text chars is a non-text byte
+    return bool(chunk.translate(_DELETE_TABLE, _TEXT_CHARS))
+
+
+# Extensions whose binary/text verdict is known up front, skipping the
+# probe read entirely; unknown extensions fall through to the heuristic
+_BINARY_EXTS = frozenset(
+    {".png", ".jpg", ".jpeg", ".gif", ".ico", ".pyc", ".so", ".o", ".a",
+     ".zip", ".gz", ".tar", ".pdf", ".woff", ".woff2", ".exe", ".dll", ".class"}
+)
+_TEXT_EXTS = frozenset(
+    {".py", ".md", ".txt", ".rst", ".toml", ".yaml", ".yml", ".json", ".cfg",
+     ".ini", ".sh", ".c", ".h", ".cpp", ".rs", ".go", ".js", ".ts", ".html", ".css"}
+)
+
+
+# On-disk cache of probe verdicts keyed by (path, mtime, size), so repeat
+# runs over an unchanged tree skip every probe read. Loaded lazily and
+# written back at exit; best-effort throughout.
+_PROBE_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "spitball",
+    "probe.pickle",
+)
+_PROBE_CACHE_MAX = 16384  # entries kept on disk; oldest evicted beyond this
+_probe_cache = None
+
+
+def _get_probe_cache():
+    """Load the persistent probe cache on first use."""
+    global _probe_cache
+    if _probe_cache is None:
+        try:
+            with open(_PROBE_CACHE_PATH, "rb") as f:
+                _probe_cache = pickle.load(f)
+        except Exception:
+            _probe_cache = {}
+        atexit.register(_save_probe_cache)
+    return _probe_cache
+
+
+def _probe_cache_key(path, mtime_us, size):
+    """Cache key at microsecond mtime precision — the statx batch path
+    only gets float seconds, so finer precision could never hit."""
+    return f"{os.path.abspath(path)}:{mtime_us}:{size}"
+
+
+def _probe_cache_get(cache, key):
+    """Look up a verdict, re-inserting hits so eviction drops cold keys."""
+    cached = cache.pop(key, None)
+    if cached is not None:
+        cache[key] = cached
+    return cached
+
+
+def _save_probe_cache():
+    if not _probe_cache:
+        return
+    try:
+        # Evict stale keys for edited files: dict order approximates LRU
+        # since hits are re-inserted at the end
+        excess = len(_probe_cache) - _PROBE_CACHE_MAX
+        if excess > 0:
+            for key in list(itertools.islice(iter(_probe_cache), excess)):
+                del _probe_cache[key]
+        os.makedirs(os.path.dirname(_PROBE_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{_PROBE_CACHE_PATH}.{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(_probe_cache, f)
+        os.replace(tmp_path, _PROBE_CACHE_PATH)
+    except Exception:
+        pass  # cache is best-effort
 
 
 def is_binary_or_large(filepath, max_size=100 * 1024):
     """Check if file is binary or exceeds size limit"""
-    if os.path.getsize(filepath) > max_size:
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext in _BINARY_EXTS:
         return True
-
     try:
-        with open(filepath, "rb") as f:
-            chunk = f.read(1024)
-            if b"\x00" in chunk:
-                return True
-            # Check for non-text characters
-            text_chars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)))
-            return bool(chunk.translate(None, text_chars))
+        st = os.stat(filepath)
+        if st.st_size > max_size:
+            return True
+        if ext in _TEXT_EXTS:
+            return False
+
+        cache = _get_probe_cache()
+        key = _probe_cache_key(filepath, st.st_mtime_ns // 1000, st.st_size)
+        cached = _probe_cache_get(cache, key)
+        if cached is not None:
+            return cached
+
+        # Raw fd read: one stat + one open instead of getsize + buffered open
+        flags = os.O_RDONLY
+        if hasattr(os, "O_NOATIME") and os.geteuid() == st.st_uid:
+            flags |= os.O_NOATIME  # skip atime writeback on Linux
+        fd = os.open(filepath, flags)
+        try:
+            if st.st_size >= 1024:
+                # Map the first page so translate() reads the page cache
+                # directly, skipping read()'s copy into a user buffer
+                try:
+                    with mmap.mmap(
+                        fd, min(4096, st.st_size), access=mmap.ACCESS_READ
+                    ) as mm:
+                        chunk = mm[:1024]
+                except (OSError, ValueError):
+                    chunk = os.read(fd, 1024)  # fs without mmap support
+            else:
+                chunk = os.read(fd, 1024)
+        finally:
+            os.close(fd)
+
+        result = _is_binary_chunk(chunk)
+        cache[key] = result
+        return result
     except Exception:
         return True  # Treat unreadable files as binary
 
 
+_URING_DEPTH = 256
+
+
+def _probe_files_io_uring(files, max_size=100 * 1024):
+    """Batch stat + 1 KiB probe reads through one io_uring ring.
+
+    Returns {path: is_binary_or_large decision}. Written against the
+    liburing binding's 2026-era API (Ring/Cqe/Statx objects; paths are
+    resolved relative to AT_FDCWD by default, matching the cwd-relative
+    paths this tool produces). Raises ImportError without a compatible
+    binding and OSError when the kernel rejects the ring; callers fall
+    back to the serial probe on exactly those.
+    """
+    import liburing
+
+    if not hasattr(liburing, "Ring"):
+        # pre-2026 bindings expose a different, incompatible API
+        raise ImportError("liburing >= 2026.1.1 required for the batched probe")
+
+    decisions = {}
+    cache = _get_probe_cache()
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(_URING_DEPTH, ring)
+    try:
+        for start in range(0, len(files), _URING_DEPTH):
+            batch = files[start : start + _URING_DEPTH]
+
+            # Phase 1: one statx submission per file, reaped in bulk
+            stats = [liburing.Statx() for _ in batch]
+            for i, path in enumerate(batch):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_statx(
+                    sqe, stats[i], path, 0,
+                    liburing.STATX_SIZE | liburing.STATX_MTIME,
+                )
+                liburing.io_uring_sqe_set_data64(sqe, i)
+            liburing.io_uring_submit_and_wait(ring, len(batch))
+            sizes = {}
+            for _ in range(len(batch)):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                try:
+                    # the binding raises the completion's errno from .res
+                    sizes[entry.user_data] = (
+                        stats[entry.user_data].size if entry.res == 0 else None
+                    )
+                except OSError:
+                    sizes[entry.user_data] = None
+                liburing.io_uring_cq_advance(ring, 1)
+
+            # Phase 2: batched 1 KiB reads for files that passed the size
+            # check and have no cached verdict
+            pending = []  # (index, fd, buf, cache key)
+            for i, path in enumerate(batch):
+                size = sizes[i]
+                if size is None:
+                    decisions[path] = True  # unreadable: treat as binary
+                    continue
+                if size > max_size:
+                    decisions[path] = True
+                    continue
+                if os.path.splitext(path)[1].lower() in _TEXT_EXTS:
+                    decisions[path] = False  # known text: size check suffices
+                    continue
+                key = _probe_cache_key(path, int(stats[i].mtime * 1e6), size)
+                cached = _probe_cache_get(cache, key)
+                if cached is not None:
+                    decisions[path] = cached
+                    continue
+                fd = os.open(path, os.O_RDONLY)
+                buf = bytearray(1024)
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_read(sqe, fd, buf, 0)
+                liburing.io_uring_sqe_set_data64(sqe, i)
+                pending.append((i, fd, buf, key))
+            if pending:
+                liburing.io_uring_submit_and_wait(ring, len(pending))
+                nread = {}
+                for _ in range(len(pending)):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    entry = cqe[0]
+                    try:
+                        nread[entry.user_data] = entry.res
+                    except OSError:
+                        nread[entry.user_data] = -1
+                    liburing.io_uring_cq_advance(ring, 1)
+                for i, fd, buf, key in pending:
+                    os.close(fd)
+                    res = nread.get(i, -1)
+                    if res < 0:
+                        decisions[batch[i]] = True
+                    else:
+                        verdict = _is_binary_chunk(bytes(buf[:res]))
+                        decisions[batch[i]] = verdict
+                        cache[key] = verdict
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return decisions
+
+
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # I/O-bound, oversubscribe
+
+
+def probe_files(files, max_size=100 * 1024):
+    """Run the binary/large probe over many files, batching when possible."""
+    if not files:
+        return {}
+    # Known binary extensions need no I/O at all
+    decisions = {
+        f: True for f in files if os.path.splitext(f)[1].lower() in _BINARY_EXTS
+    }
+    files = [f for f in files if f not in decisions]
+    if not files:
+        return decisions
+    try:
+        decisions.update(_probe_files_io_uring(files, max_size))
+        return decisions
+    except (ImportError, OSError):
+        # No (compatible) liburing or no kernel io_uring support: probe
+        # via thread pool. Anything else propagates so binding/API
+        # breakage stays visible instead of silently degrading.
+        pass
+    probe = functools.partial(is_binary_or_large, max_size=max_size)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        decisions.update(zip(files, executor.map(probe, files, chunksize=32)))
+    return decisions
+
+
 def open_file_with_default_viewer(filepath):
     """
     Opens a file with its default OS viewer in a cross-platform way.
@@ -65,13 +420,204 @@ def open_file_with_default_viewer(filepath):
         subprocess.call(["xdg-open", filepath])
 
 
-def handle_output(md_content, output_file=None, open_file=False, enable_logging=True):
-    # Handle file output
+def _xclip_clipboard(md_chunks):
+    """Pipe chunks into a spawned xclip; returns True on success."""
+    process = subprocess.Popen(
+        ["xclip", "-selection", "clipboard"], stdin=subprocess.PIPE, text=True
+    )
+    try:
+        for chunk in md_chunks:
+            process.stdin.write(chunk)
+        process.stdin.close()
+    except OSError:  # xclip exited early; communicate() used to eat EPIPE
+        process.wait()
+        return False
+    process.wait()
+    return process.returncode == 0
+
+
+# Parent's reference to the X connection shared with the selection-serving
+# child; kept so garbage collection doesn't close the socket under it
+_xlib_display = None
+
+
+def _xlib_clipboard(md_chunks):
+    """Own the X11 CLIPBOARD selection in-process instead of spawning xclip.
+
+    Skips the fork+exec+display-open cost of xclip for typical outputs.
+    The display connection and selection ownership are acquired and
+    verified first; only then is a child forked to keep serving
+    SelectionRequest events until another client takes the selection
+    (the same trick xclip uses to daemonize), so the main process can
+    exit immediately. Payloads too large for one change_property request
+    would need the INCR protocol, which this does not speak; those and
+    any acquisition failure are handed to xclip. Raises ImportError
+    without python-xlib.
+    """
+    from Xlib import X, Xatom, display
+    from Xlib.protocol import event
+
+    text = "".join(md_chunks)
+    data = text.encode("utf-8")
+    try:
+        d = display.Display()
+    except Exception:
+        return _xclip_clipboard([text])  # no usable display
+    try:
+        # One change_property per transfer: stay under the server's max
+        # request size, with headroom for the request framing
+        if len(data) > d.display.info.max_request_length * 4 - 1024:
+            raise OSError("payload needs INCR transfer")
+        win = d.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        clipboard = d.intern_atom("CLIPBOARD")
+        targets = d.intern_atom("TARGETS")
+        utf8 = d.intern_atom("UTF8_STRING")
+        win.set_selection_owner(clipboard, X.CurrentTime)
+        d.flush()
+        if d.get_selection_owner(clipboard) != win:
+            raise OSError("selection ownership refused")
+    except Exception:
+        try:
+            d.close()
+        except Exception:
+            pass
+        return _xclip_clipboard([text])
+
+    global _xlib_display
+    _xlib_display = d  # the child inherits (a dup of) this socket
+    try:
+        pid = os.fork()
+    except OSError:
+        _xlib_display = None
+        try:
+            d.close()
+        except Exception:
+            pass
+        return _xclip_clipboard([text])
+    if pid > 0:
+        return True  # ownership verified above; child serves requests
+
+    # Child: detach the inherited std fds so pipelines reading our
+    # stdout see EOF instead of hanging until the selection is replaced
+    try:
+        devnull = os.open(os.devnull, os.O_RDWR)
+        os.dup2(devnull, 0)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        if devnull > 2:
+            os.close(devnull)
+    except OSError:
+        pass
+    try:
+        while True:
+            ev = d.next_event()
+            if ev.type == X.SelectionClear:
+                break  # someone else owns the clipboard now
+            if ev.type != X.SelectionRequest:
+                continue
+            prop = ev.property if ev.property else ev.target
+            if ev.target == targets:
+                ev.requestor.change_property(
+                    prop, Xatom.ATOM, 32, [targets, utf8, Xatom.STRING]
+                )
+            elif ev.target in (utf8, Xatom.STRING):
+                ev.requestor.change_property(prop, ev.target, 8, data)
+            else:
+                prop = X.NONE
+            ev.requestor.send_event(
+                event.SelectionNotify(
+                    time=ev.time,
+                    requestor=ev.requestor,
+                    selection=ev.selection,
+                    target=ev.target,
+                    property=prop,
+                )
+            )
+            d.flush()
+    except Exception:
+        os._exit(1)
+    os._exit(0)
+
+
+def _rel_path(path, _cwd_prefix=os.getcwd() + os.sep):
+    """Path relative to the cwd via prefix strip; os.path.relpath walks
+    the filesystem-path logic per call, this is a string slice."""
+    if path.startswith(_cwd_prefix):
+        return path[len(_cwd_prefix) :]
+    if path.startswith(f".{os.sep}"):
+        return path[2:]
+    if not os.path.isabs(path):
+        return path
+    return os.path.relpath(path)  # outside the cwd: needs the full logic
+
+
+def _md_header(file_path):
+    """Markdown header line for a file, depth encoded as header level."""
+    rel_path = _rel_path(file_path)
+    header_mark = "#" * (rel_path.count(os.sep) + 1)
+    return f"{header_mark} {rel_path}\n"
+
+
+def _sendfile_md(out_fd, files):
+    """Concatenate files into out_fd, copying content via os.sendfile.
+
+    Kernel-to-kernel copy skips the userspace read + UTF-8 decode/encode
+    round-trip; only the header and fence bytes pass through Python. If
+    the kernel refuses sendfile mid-file (e.g. an fs without splice
+    support), the remainder is copied with plain read/write so the
+    document stays well-formed.
+    """
+    sep = b""
+    for file_path in files:
+        os.write(out_fd, sep + _md_header(file_path).encode("utf-8"))
+        sep = b"\n"
+        try:
+            in_fd = os.open(file_path, os.O_RDONLY)
+        except OSError as e:
+            msg = f"```\nError reading file: {e}\n```\n"
+            os.write(out_fd, sep + msg.encode("utf-8"))
+            continue
+        try:
+            size = os.fstat(in_fd).st_size
+            os.write(out_fd, sep + b"```\n")
+            offset = 0
+            while offset < size:
+                try:
+                    sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                except OSError:
+                    sent = 0  # fall back to read/write for the remainder
+                if sent == 0:
+                    break
+                offset += sent
+            os.lseek(in_fd, offset, os.SEEK_SET)
+            while True:
+                buf = os.read(in_fd, 64 * 1024)
+                if not buf:
+                    break
+                os.write(out_fd, buf)
+            os.write(out_fd, b"\n```\n")
+        finally:
+            os.close(in_fd)
+
+
+def handle_output(
+    md_chunks, output_file=None, open_file=False, enable_logging=True, source_files=None
+):
+    # md_chunks is an iterable of str; stream it out without ever holding
+    # the whole document in memory. When writing to a file and the source
+    # list is known, sendfile copies content without entering userspace.
+    # Linux only: other platforms (e.g. Darwin) expose os.sendfile but
+    # reject regular-file destinations.
+    use_sendfile = source_files is not None and sys.platform == "linux"
     if output_file is not None:
         if output_file == "":
             # Create temp file
             with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
-                tmp.write(md_content.encode("utf-8"))
+                if use_sendfile:
+                    _sendfile_md(tmp.fileno(), source_files)
+                else:
+                    for chunk in md_chunks:
+                        tmp.write(chunk.encode("utf-8"))
                 output_path = tmp.name
         else:
             # Use specified file path, ensure .txt extension
@@ -84,9 +630,19 @@ def handle_output(md_content, output_file=None, open_file=False, enable_logging=
                 exist_ok=True,
             )
 
-        # Write content to file
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(md_content)
+            # Stream content to file
+            if use_sendfile:
+                out_fd = os.open(
+                    output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+                )
+                try:
+                    _sendfile_md(out_fd, source_files)
+                finally:
+                    os.close(out_fd)
+            else:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    for chunk in md_chunks:
+                        f.write(chunk)
 
         if enable_logging:
             print(f"Markdown output saved to: {output_path}")
@@ -95,13 +651,14 @@ def handle_output(md_content, output_file=None, open_file=False, enable_logging=
         if open_file:
             open_file_with_default_viewer(output_path)
     else:
-        # Original clipboard behavior
+        # Clipboard output: serve the selection in-process when python-xlib
+        # is available, otherwise fall back to spawning xclip
         try:
-            process = subprocess.Popen(
-                ["xclip", "-selection", "clipboard"], stdin=subprocess.PIPE, text=True
-            )
-            process.communicate(input=md_content)
-            if process.returncode == 0:
+            try:
+                ok = _xlib_clipboard(md_chunks)
+            except ImportError:
+                ok = _xclip_clipboard(md_chunks)
+            if ok:
                 if enable_logging:
                     print("Markdown output copied to clipboard.")
             else:
@@ -109,6 +666,10 @@ def handle_output(md_content, output_file=None, open_file=False, enable_logging=
         except FileNotFoundError:
             print("xclip not found. Install it with: sudo apt install xclip")
 
+
+_TREE_CHARS = "├─│└"
+
+
 def parse_tree_clipboard():
     """Return list of (depth, name, is_dir) parsed from clipboard tree."""
     try:
@@ -118,13 +679,8 @@ def parse_tree_clipboard():
     lines = [ln.rstrip() for ln in raw.splitlines() if ln.strip()]
     entries = []
     for ln in lines:
-        # count leading tree chars (4 per level)
-        prefix_len = 0
-        for ch in ln:
-            if ch in "├──│└":
-                prefix_len += 1
-            else:
-                break
+        # count leading tree chars (4 per level); lstrip does the scan in C
+        prefix_len = len(ln) - len(ln.lstrip(_TREE_CHARS))
         depth = prefix_len // 4
         name = ln[prefix_len:].strip()
         if not name:
@@ -137,27 +693,37 @@ def parse_tree_clipboard():
 def create_tree_from_clipboard(dry_run=False, edit=False):
     """Create folder/file structure from clipboard tree."""
     entries = parse_tree_clipboard()
-    # stack to track current directory path
+    # First pass: resolve paths, tracking depth with a directory stack
     stack = []
+    dirs = set()
     created_files = []
     for depth, name, is_dir in entries:
         # pop stack until correct depth
         while len(stack) > depth:
             stack.pop()
+        path = os.path.join(*stack, name)
         if is_dir:
-            path = os.path.join(*stack, name)
-            if dry_run:
-                print("mkdir", path)
-            else:
-                os.makedirs(path, exist_ok=True)
+            dirs.add(path)
             stack.append(name)
         else:
-            path = os.path.join(*stack, name)
-            if dry_run:
-                print("touch", path)
-            else:
-                Path(path).touch()
             created_files.append(path)
+
+    # Second pass: one makedirs per leaf dir (ancestors come for free),
+    # then touch files; open('ab') skips the extra stat Path.touch does
+    leaf_dirs = [
+        d for d in sorted(dirs) if not any(o.startswith(d + os.sep) for o in dirs)
+    ]
+    if dry_run:
+        for d in leaf_dirs:
+            print("mkdir", d)
+        for f in created_files:
+            print("touch", f)
+        return created_files
+    for d in leaf_dirs:
+        os.makedirs(d, exist_ok=True)
+    for f in created_files:
+        open(f, "ab").close()
+
     if edit and not dry_run:
         editor = os.environ.get("EDITOR", "vi")
         for f in created_files:
@@ -165,85 +731,97 @@ def create_tree_from_clipboard(dry_run=False, edit=False):
     return created_files
 
 
-def main(patterns, enable_logging=True, output_file=None, open_file=False):
-    # Load gitignore patterns
-    gitignore_patterns = load_gitignore_patterns()
+def _read_text(path):
+    """Read file text without newline translation, so chunked output
+    carries the same bytes the sendfile path copies (CRLF included)."""
+    with open(path, "r", errors="replace", newline="") as f:
+        return f.read()
+
+
+def iter_md_chunks(files):
+    """Yield markdown chunks (header, then fenced content) per file."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        # Overlap reads across files but cap outstanding futures at the
+        # worker count, so peak memory stays a window of files rather
+        # than the whole corpus; yields stay in sorted order
+        remaining = iter(files)
+        pending = collections.deque(
+            (f, executor.submit(_read_text, f))
+            for f in itertools.islice(remaining, _MAX_WORKERS)
+        )
+        sep = ""
+        while pending:
+            file_path, future = pending.popleft()
+            for nxt in itertools.islice(remaining, 1):
+                pending.append((nxt, executor.submit(_read_text, nxt)))
+            try:
+                body = f"```\n{future.result()}\n```\n"
+            except Exception as e:
+                body = f"```\nError reading file: {e}\n```\n"
+            # One f-string per file: a single yield instead of two
+            yield f"{sep}{_md_header(file_path)}\n{body}"
+            sep = "\n"
 
-    # Get all files matching glob
-    files = []
-    for pattern in patterns:
-        fs = glob.glob(pattern, recursive=True)
-        files.extend([f for f in fs if os.path.isfile(f)])
-    files = sorted(set(files))
+
+def main(patterns, enable_logging=True, output_file=None, open_file=False):
+    # Load compiled gitignore spec
+    spec = load_gitignore_spec()
 
     # Track excluded files
     excluded_files = []
 
-    # Always filter .git paths
-    filtered_files = []
+    # Get all files matching glob; full-tree patterns go through the
+    # pruning walker instead of glob-then-filter
+    files = []
+    for pattern in patterns:
+        if pattern in _RECURSIVE_ALL:
+            files.extend(
+                _walk(".", spec, excluded_files if enable_logging else None)
+            )
+        else:
+            fs = glob.glob(pattern, recursive=True)
+            files.extend([f for f in fs if os.path.isfile(f)])
+    # Strip any leading './' (walker and ./-style patterns produce it,
+    # bare patterns don't) so the same file dedupes across patterns
+    dot_prefix = f".{os.sep}"
+    files = sorted(
+        {f[2:] if f.startswith(dot_prefix) else f for f in files}
+    )
+
+    # Fused filter: cheap checks (git path, gitignore membership) in one
+    # pass, then the expensive binary/large probe batched over survivors
+    ignored = set(spec.match_files(files)) if spec is not None else frozenset()
+    candidates = []
     for f in files:
         if is_git_path(f):
             if enable_logging:
                 excluded_files.append((f, "git path"))
+        elif f in ignored:
+            if enable_logging:
+                excluded_files.append((f, "gitignore"))
         else:
-            filtered_files.append(f)
-    files = filtered_files
+            candidates.append(f)
 
-    # Filter binary/large files
-    filtered_files = []
-    for f in files:
-        if is_binary_or_large(f):
+    probes = probe_files(candidates)
+    files = []
+    for f in candidates:
+        if probes[f]:
             if enable_logging:
                 excluded_files.append((f, "binary/large"))
         else:
-            filtered_files.append(f)
-    files = filtered_files
-
-    # Filter with gitignore if patterns exist
-    if gitignore_patterns:
-        try:
-            import pathspec
-
-            spec = pathspec.PathSpec.from_lines("gitwildmatch", gitignore_patterns)
-            filtered_files = []
-            for f in files:
-                if spec.match_file(f):
-                    if enable_logging:
-                        excluded_files.append((f, "gitignore"))
-                else:
-                    filtered_files.append(f)
-            files = filtered_files
-        except ImportError:
-            print(
-                "Warning: pathspec module not found. Install with: pip install pathspec"
-            )
-            print("Skipping .gitignore filtering.")
+            files.append(f)
 
     files.sort()
 
     if enable_logging:
         log_file_status(files, excluded_files)
 
-    md_lines = []
-    for file_path in files:
-        rel_path = os.path.relpath(file_path)
-        header_level = rel_path.count(os.sep) + 1
-        header_mark = "#" * header_level
-        md_lines.append(f"{header_mark} {rel_path}\n")
-        try:
-            with open(file_path, "r") as f:
-                content = f.read()
-            md_lines.append(f"```\n{content}\n```\n")
-        except Exception as e:
-            md_lines.append(f"```\nError reading file: {e}\n```\n")
-
-    md_content = "\n".join(md_lines)
-
     handle_output(
-        md_content,
+        iter_md_chunks(files),
         output_file=output_file,
         open_file=open_file,
         enable_logging=enable_logging,
+        source_files=files,
     )
 
 